@@ -1,3 +1,5 @@
+import hashlib
+
 import streamlit as st
 from backend import (
     AESCipher,
@@ -5,6 +7,7 @@ from backend import (
     load_vehicle_dataset,
     build_event_from_row,
     evaluate_decision,
+    evaluate_decisions_batch,
 )
 
 # ---------- PAGE CONFIG & CSS ----------
@@ -45,20 +48,76 @@ st.markdown(
 )
 st.write("")
 
+# ---------- CACHED RESOURCES ----------
+
+
+@st.cache_data(show_spinner=False)
+def cached_dataset():
+    # Parsed once and memoized across reruns
+    return load_vehicle_dataset()
+
+
+@st.cache_data(show_spinner=False)
+def cached_decisions(df):
+    return evaluate_decisions_batch(df)
+
+
+@st.cache_resource
+def get_cipher():
+    # Same police key for everyone; AESGCM is thread-safe
+    return AESCipher()
+
+
+def tx_meta(tx):
+    # Plaintext metadata lives in a side table; records only carry meta_id
+    return st.session_state.tx_meta[tx["meta_id"]]
+
+
+def cached_plaintext(tx):
+    return st.session_state.decrypted.get(hashlib.sha256(tx["ciphertext"]).digest())
+
+
+def decrypt_records(records):
+    # Decrypt whatever is not cached yet in a single decrypt_many call
+    cache = st.session_state.decrypted
+    keyed = [(hashlib.sha256(r["ciphertext"]).digest(), r) for r in records]
+    missing = [(k, r) for k, r in keyed if k not in cache]
+    if missing:
+        plaintexts = st.session_state.cipher.decrypt_many(
+            [(r["nonce"], r["ciphertext"]) for _, r in missing]
+        )
+        for (k, _), pt in zip(missing, plaintexts):
+            cache[k] = pt
+    return [cache[k] for k, _ in keyed]
+
+
+def hex_view(tx):
+    # Raw bytes are kept in session state; hex-encode only when rendering
+    return {k: v.hex() if isinstance(v, bytes) else v for k, v in tx.items()}
+
+
 # ---------- SESSION STATE INIT ----------
 
+# The ledger stays per-session (each user mines their own chain alongside
+# their own rejected cases); only the keyed cipher is process-global.
 if "bc" not in st.session_state:
     st.session_state.bc = Blockchain()
 if "cipher" not in st.session_state:
-    st.session_state.cipher = AESCipher()
+    st.session_state.cipher = get_cipher()
 if "current_event" not in st.session_state:
     st.session_state.current_event = None
 if "current_decision" not in st.session_state:
     st.session_state.current_decision = None
 if "driver_response" not in st.session_state:
     st.session_state.driver_response = None
+if "tx_meta" not in st.session_state:
+    # list of dicts: {vehicle, exit_point, driver_response}, indexed by meta_id
+    st.session_state.tx_meta = []
+if "decrypted" not in st.session_state:
+    # plaintext cache keyed by sha256(ciphertext)
+    st.session_state.decrypted = {}
 if "rejected_cases" not in st.session_state:
-    # list of dicts: {nonce, ciphertext, vehicle, exit_point}
+    # list of dicts: {nonce, ciphertext, meta_id}
     st.session_state.rejected_cases = []
 
 tab_control, tab_ledger, tab_rejected = st.tabs(
@@ -76,12 +135,17 @@ with tab_control:
 
     df = None
     try:
-        df = load_vehicle_dataset()
+        df = cached_dataset()
         st.caption(f"Loaded dataset with {len(df)} records")
     except Exception as e:
         st.error(f"Error loading dataset: {e}")
 
     if df is not None:
+        with st.expander("📊 Batch triage (all records)"):
+            decisions = cached_decisions(df)
+            st.caption(f"{int(decisions['overspeed'].sum())} overspeed records")
+            st.dataframe(decisions)
+
         idx = st.slider("Select Vehicle Trip Record", 0, len(df) - 1, 0)
 
         if st.button("Load IoT Event"):
@@ -178,7 +242,7 @@ with tab_control:
                 "driver_response": st.session_state.driver_response,
             }
 
-            nonce_hex, ciphertext_hex = st.session_state.cipher.encrypt(payload)
+            nonce, ciphertext = st.session_state.cipher.encrypt(payload)
 
             # Minimal metadata for quick viewing (no need to decrypt for this)
             meta_vehicle = (
@@ -192,12 +256,16 @@ with tab_control:
                 else None
             )
 
-            tx = {
-                "nonce": nonce_hex,
-                "ciphertext": ciphertext_hex,
-                "driver_response": st.session_state.driver_response,
+            st.session_state.tx_meta.append({
                 "vehicle": meta_vehicle,
                 "exit_point": meta_exit,
+                "driver_response": st.session_state.driver_response,
+            })
+
+            tx = {
+                "nonce": nonce,
+                "ciphertext": ciphertext,
+                "meta_id": len(st.session_state.tx_meta) - 1,
             }
 
             if st.session_state.driver_response == "REJECTED":
@@ -221,20 +289,41 @@ with tab_control:
 
 # ---------- BLOCKCHAIN LEDGER TAB ----------
 
-with tab_ledger:
-    st.markdown('<div class="section-header">📦 Blockchain Ledger</div>', unsafe_allow_html=True)
+LEDGER_PAGE_SIZE = 10
+
+
+@st.fragment
+def render_ledger():
+    # Runs as a fragment so its widgets rerun only this block, and only
+    # one page of blocks is rendered at a time.
+    chain = st.session_state.bc.chain
+    last_page = (len(chain) - 1) // LEDGER_PAGE_SIZE
+    page = 0
+    if last_page > 0:
+        # Keyed so the selection survives max_value changing as blocks are mined
+        if st.session_state.get("ledger_page", 0) > last_page:
+            st.session_state.ledger_page = last_page
+        page = st.number_input(
+            "Page", min_value=0, max_value=last_page, step=1, key="ledger_page"
+        )
+    st.caption(f"{len(chain)} blocks — page {page + 1} of {last_page + 1}")
 
-    for blk in st.session_state.bc.chain[::-1]:
+    start = page * LEDGER_PAGE_SIZE
+    for blk in chain[::-1][start:start + LEDGER_PAGE_SIZE]:
         with st.expander(f"Block #{blk.index} | {blk.timestamp}"):
 
             st.write("📌 Block Metadata")
-            st.json({"hash": blk.hash, "prev_hash": blk.prev_hash})
+            st.json({
+                "hash": blk.hash,
+                "prev_hash": blk.prev_hash,
+                "merkle_root": blk.merkle_root,
+            })
 
             st.write("📦 Transactions")
             for t_i, tx in enumerate(blk.data):
                 with st.container():
                     if isinstance(tx, dict) and "ciphertext" in tx:
-                        vehicle = tx.get("vehicle", "N/A")
+                        vehicle = tx_meta(tx).get("vehicle", "N/A")
                         st.markdown(f"**TX #{t_i+1}** — Vehicle: `{vehicle}`")
                     else:
                         # This is the genesis block or other header object
@@ -244,24 +333,27 @@ with tab_ledger:
 
                     # Show raw blockchain TX metadata
                     st.json({
-                        "nonce": tx["nonce"],
-                        "ciphertext": tx["ciphertext"],
-                        "driver_response": tx.get("driver_response"),
+                        "nonce": tx["nonce"].hex(),
+                        "ciphertext": tx["ciphertext"].hex(),
+                        "driver_response": tx_meta(tx).get("driver_response"),
                     })
 
                     # Decrypt button
-                    if st.button(f"🔓 Decrypt TX #{t_i+1} in Block {blk.index}", key=f"ledger_decrypt_{blk.index}_{t_i}"):
+                    decrypted = cached_plaintext(tx)
+                    if decrypted is None and st.button(f"🔓 Decrypt TX #{t_i+1} in Block {blk.index}", key=f"ledger_decrypt_{blk.index}_{t_i}"):
                         try:
-                            decrypted = st.session_state.cipher.decrypt(
-                                tx["nonce"], tx["ciphertext"]
-                            )
-
-                            st.success("Decrypted Full Transaction:")
-                            st.json(decrypted)
-
+                            decrypted = decrypt_records([tx])[0]
                         except Exception as e:
                             st.error(f"❌ Decryption failed: {e}")
 
+                    if decrypted is not None:
+                        st.success("Decrypted Full Transaction:")
+                        st.json(decrypted)
+
+
+with tab_ledger:
+    st.markdown('<div class="section-header">📦 Blockchain Ledger</div>', unsafe_allow_html=True)
+    render_ledger()
 
 
 # ---------- REJECTED GUIDANCE TAB ----------
@@ -276,9 +368,16 @@ with tab_rejected:
     if not cases:
         st.info("No rejected cases yet.")
     else:
+        if st.button("🔓 Decrypt all cases", key="decrypt_all_cases"):
+            try:
+                decrypt_records(cases)
+            except Exception as e:
+                st.error(f"Decryption failed: {e}")
+
         for i, case in enumerate(cases[::-1]):
-            vehicle = case.get("vehicle", "Unknown")
-            exit_point = case.get("exit_point", "Unknown")
+            meta = tx_meta(case)
+            vehicle = meta.get("vehicle", "Unknown")
+            exit_point = meta.get("exit_point", "Unknown")
 
             with st.expander(f"🚫 Case #{i+1} — Vehicle: {vehicle}"):
                 # Big highlighted vehicle banner
@@ -330,18 +429,19 @@ with tab_rejected:
                 )
 
                 # Decrypt button for police/authorized users
-                if st.button(
+                decrypted = cached_plaintext(case)
+                if decrypted is None and st.button(
                     f"🔓 Decrypt full case #{i+1}", key=f"decrypt_case_{i+1}"
                 ):
                     try:
-                        decrypted = st.session_state.cipher.decrypt(
-                            case["nonce"], case["ciphertext"]
-                        )
-                        st.success("Decrypted case payload:")
-                        st.json(decrypted)
+                        decrypted = decrypt_records([case])[0]
                     except Exception as e:
                         st.error(f"Decryption failed: {e}")
 
+                if decrypted is not None:
+                    st.success("Decrypted case payload:")
+                    st.json(decrypted)
+
                 # For debugging / auditing, you can also show raw encrypted record:
                 if st.checkbox(f"Show raw encrypted record #{i+1}", key=f"raw_case_{i+1}"):
-                    st.json(case)   
\ No newline at end of file
+                    st.json(hex_view(case))   
\ No newline at end of file
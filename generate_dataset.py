@@ -1,6 +1,5 @@
+import numpy as np
 import pandas as pd
-import random
-from datetime import datetime, timedelta
 
 # NYC & US Highway locations
 locations = [
@@ -20,57 +19,62 @@ state_areas = {
     "IL": ["217", "224", "309", "312", "331", "447", "464", "618", "630", "708", "773", "779", "815", "847", "872"]
 }
 
-def random_plate():
-    st = random.choice(list(state_areas.keys()))
-    letters = ''.join(random.choices("ABCDEFGHIJKLMNOPQRSTUVWXYZ", k=3))
-    numbers = random.randint(1000, 9999)
-    return f"{st}-{letters}{numbers}", st
+N = 500
+rng = np.random.default_rng()
+states = np.array(list(state_areas.keys()))
+alphabet = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
 
-def random_phone(state):
-    code = random.choice(state_areas[state])   # area code (e.g. 917)
-    prefix = random.randint(200, 999)         # first 3 digits after area
-    line = random.randint(0, 9999)            # last 4 digits
-    return f"+1-{code}-{prefix}-{line:04d}"
+# Plates: state + 3 letters + 4 digits
+plate_states = rng.choice(states, size=N)
+letters = alphabet[rng.integers(0, 26, (N, 3))]
+numbers = rng.integers(1000, 10000, size=N).astype(str)
+plates = np.char.add(np.char.add(plate_states, "-"), letters[:, 0])
+plates = np.char.add(np.char.add(plates, letters[:, 1]), letters[:, 2])
+plates = np.char.add(plates, numbers)
 
-def random_email(plate):
-    name = plate.replace("-", "").lower()
-    domains = ["gmail.com", "yahoo.com", "outlook.com", "icloud.com"]
-    return f"{name}@{random.choice(domains)}"
+# Phones: area code drawn from the plate's state
+area_codes = np.empty(N, dtype="<U3")
+for state, codes in state_areas.items():
+    mask = plate_states == state
+    area_codes[mask] = rng.choice(codes, size=mask.sum())
+prefixes = rng.integers(200, 1000, size=N).astype(str)     # first 3 digits after area
+lines = np.char.zfill(rng.integers(0, 10000, size=N).astype(str), 4)  # last 4 digits
+phones = np.char.add(np.char.add("+1-", area_codes), "-")
+phones = np.char.add(np.char.add(np.char.add(phones, prefixes), "-"), lines)
 
-def random_time():
-    start = datetime(2025, 11, 27, random.randint(6, 22), random.randint(0, 59))
-    duration = random.randint(10, 60)
-    end = start + timedelta(minutes=duration)
-    return start.isoformat(), end.isoformat()
+# Emails
+domains = np.array(["gmail.com", "yahoo.com", "outlook.com", "icloud.com"])
+names = np.char.lower(np.char.replace(plates, "-", ""))
+emails = np.char.add(np.char.add(names, "@"), rng.choice(domains, size=N))
 
-data = []
+# Entry/exit points: exit is offset from entry so the two always differ
+locs = np.array(locations)
+entry_idx = rng.integers(0, len(locs), size=N)
+exit_idx = (entry_idx + rng.integers(1, len(locs), size=N)) % len(locs)
 
-for _ in range(500):
-    plate, state = random_plate()
-    phone = random_phone(state)
-    email = random_email(plate)
+# Trip times on 2025-11-27, 06:00–22:59 start, 10–60 minute duration
+start_min = rng.integers(6, 23, size=N) * 60 + rng.integers(0, 60, size=N)
+duration = rng.integers(10, 61, size=N)
+day = np.datetime64("2025-11-27T00:00:00")
+entry_times = day + start_min.astype("timedelta64[m]")
+exit_times = entry_times + duration.astype("timedelta64[m]")
 
-    entry = random.choice(locations)
-    exit = random.choice(locations)
-    while exit == entry:
-        exit = random.choice(locations)
+# Speeds (mph limits converted to km/h)
+speed_limits = rng.choice([50, 60, 65, 70, 75, 80], size=N)
+speed_kmph = np.round(rng.uniform(speed_limits - 15, speed_limits + 20) * 1.60934, 2)
+speed_limit_kmph = np.round(speed_limits * 1.60934, 2)
 
-    entry_time, exit_time = random_time()
-
-    speed_limit = random.choice([50, 60, 65, 70, 75, 80])
-    speed_kmph = round(random.uniform(speed_limit - 15, speed_limit + 20) * 1.60934, 2)
-    speed_limit_kmph = round(speed_limit * 1.60934, 2)
-
-    data.append([
-        plate, phone, email, entry, exit, entry_time, exit_time,
-        speed_kmph, speed_limit_kmph
-    ])
-
-df = pd.DataFrame(data, columns=[
-    "plate", "phone", "email", "entry_point", "exit_point",
-    "entry_time", "exit_time",
-    "speed_kmph", "speed_limit_kmph"
-])
+df = pd.DataFrame({
+    "plate": plates,
+    "phone": phones,
+    "email": emails,
+    "entry_point": locs[entry_idx],
+    "exit_point": locs[exit_idx],
+    "entry_time": np.datetime_as_string(entry_times, unit="s"),
+    "exit_time": np.datetime_as_string(exit_times, unit="s"),
+    "speed_kmph": speed_kmph,
+    "speed_limit_kmph": speed_limit_kmph,
+})
 
 df.to_csv("us_traffic_data.csv", index=False)
-print("✔ Updated dataset with PHONE + EMAIL (500 rows)")
+print(f"✔ Updated dataset with PHONE + EMAIL ({N} rows)")